@@ -23,18 +23,44 @@ from __future__ import annotations
 import os
 import sys
 import json
+import atexit
 import time
+import random
 import csv
 import logging
+import logging.handlers
+import queue
 import argparse
+import hashlib
+import threading
+from functools import partial
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+try:
+    import orjson  # optional, much faster JSON; falls back to stdlib json
+except ImportError:
+    orjson = None
+
 load_dotenv()
 
+def json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps_bytes(data) -> bytes:
+    return orjson.dumps(data) if orjson else json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+def json_dumps_pretty(data) -> str:
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
 # ---------------- CONFIG ----------------
 NOTION_TOKEN = os.getenv("NOTION_TOKEN")  # must be set in environment
 if not NOTION_TOKEN:
@@ -56,82 +82,246 @@ HEADERS = {
     "Content-Type": "application/json"
 }
 
-# Logging
+# Shared HTTP session: keeps connections to api.notion.com alive between calls
+# instead of paying a fresh TCP+TLS handshake on every request.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=0))
+SESSION.headers.update(HEADERS)
+atexit.register(SESSION.close)
+
+# Concurrency: a few workers share SESSION; the token bucket below keeps the
+# aggregate request rate under Notion's ~3 req/s limit.
+MAX_WORKERS = 5
+REQUESTS_PER_SECOND = 3.0
+
+# Read cache for duplicate-detection queries (seconds / max entries)
+QUERY_CACHE_TTL = 300
+QUERY_CACHE_SIZE = 256
+
+# Logging: records go onto a queue and a background listener thread does the
+# actual file/stdout writes, so worker threads never block on log I/O.
 LOG_PATH = Path("notion_sync.log")
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.FileHandler(LOG_PATH), logging.StreamHandler(sys.stdout)]
-)
+LOG_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Install the queue handler and start the listener; repeat calls are no-ops."""
+    global _log_listener
+    if _log_listener is not None:
+        return _log_listener
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [logging.FileHandler(LOG_PATH), logging.StreamHandler(sys.stdout)]
+    for h in handlers:
+        h.setFormatter(formatter)
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    return _log_listener
+
+setup_logging()
+
+class RateLimiter:
+    """Thread-safe token bucket; acquire() blocks until a request slot is free."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                reserved = now >= self._paused_until
+                if reserved:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                    self._last = now
+                    # Reserve a token even if it takes the bucket negative, so concurrent
+                    # callers queue up behind each other instead of all waking at once.
+                    self._tokens -= 1
+                    wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+                else:
+                    wait = self._paused_until - now
+            if wait:
+                time.sleep(wait)
+            # A pause() may have started while we slept on a reserved slot; if so, wait it out too.
+            if reserved and time.monotonic() >= self._paused_until:
+                return
+
+    def pause(self, seconds: float):
+        """Hold back every caller for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+RATE_LIMITER = RateLimiter(REQUESTS_PER_SECOND)
 
 # Retry helper for HTTP calls
-def http_request_with_retries(method: str, url: str, headers: dict, json_payload: Optional[dict]=None, params: Optional[dict]=None, retries: int=3, backoff: float=1.0):
+def http_request_with_retries(method: str, url: str, json_payload: Optional[dict]=None, params: Optional[dict]=None, retries: int=3, backoff: float=1.0):
+    method = method.upper()
+    if method not in ("POST", "PATCH", "GET"):
+        raise ValueError("Unsupported HTTP method")
+    # Encode once up front (reused across retries); SESSION already sends the JSON Content-Type.
+    body = json_dumps_bytes(json_payload) if json_payload is not None else None
     for attempt in range(1, retries+1):
+        RATE_LIMITER.acquire()
+        # Exponential backoff with jitter for transient failures (network, 5xx).
+        delay = backoff * (2 ** (attempt - 1)) + random.uniform(0, 0.25)
         try:
-            if method.lower() == "post":
-                r = requests.post(url, headers=headers, json=json_payload, params=params, timeout=30)
-            elif method.lower() == "patch":
-                r = requests.patch(url, headers=headers, json=json_payload, params=params, timeout=30)
-            elif method.lower() == "get":
-                r = requests.get(url, headers=headers, params=params, timeout=30)
-            else:
-                raise ValueError("Unsupported HTTP method")
+            r = SESSION.request(method, url, data=body, params=params, timeout=30)
+        except requests.RequestException as e:
+            logging.warning("Request exception: %s", e)
+        else:
             if r.ok:
                 return r.json()
-            else:
-                logging.warning(f"HTTP {r.status_code} error on {url}: {r.text}")
-        except requests.RequestException as e:
-            logging.warning(f"Request exception: {e}")
-        time.sleep(backoff * attempt)
+            logging.warning("HTTP %s error on %s: %s", r.status_code, url, r.text)
+            if r.status_code == 429:
+                # Rate limited: wait exactly as long as Notion asks us to.
+                try:
+                    delay = float(r.headers.get("Retry-After", backoff * attempt))
+                except ValueError:
+                    delay = backoff * attempt
+                # The limit is shared across workers, so all of them back off, not just this one.
+                RATE_LIMITER.pause(delay)
+            elif r.status_code < 500:
+                # Other client errors (bad payload, missing permission...) won't fix themselves.
+                raise RuntimeError(f"HTTP {r.status_code} error on {url}: {r.text}")
+        if attempt < retries:
+            time.sleep(delay)
     raise RuntimeError(f"Failed HTTP request to {url} after {retries} attempts")
 
+class QueryCache:
+    """Thread-safe TTL + LRU cache of database query results.
+
+    Entries are dropped per database whenever we write a page into it, so a
+    cached "does this already exist?" answer never hides our own inserts.
+    Each clear bumps a generation counter; callers read generation() before
+    querying and pass it to set(), which discards results that raced a write.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (db_id, timestamp, results)
+        self._generations: Dict[str, int] = {}  # db_id -> bumped by clear_db
+        self._epoch = 0  # bumped by clear
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(db_id: str, property_name: str, value: str) -> str:
+        return hashlib.md5(f"{db_id}|{property_name}|{value}".encode()).hexdigest()
+
+    def get(self, db_id: str, property_name: str, value: str) -> Optional[List[dict]]:
+        k = self.key(db_id, property_name, value)
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[1] > self.ttl:
+                del self._entries[k]
+                return None
+            self._entries.move_to_end(k)
+            return list(entry[2])
+
+    def generation(self, db_id: str) -> tuple:
+        with self._lock:
+            return self._epoch, self._generations.get(db_id, 0)
+
+    def set(self, db_id: str, property_name: str, value: str, results: List[dict], generation: tuple):
+        k = self.key(db_id, property_name, value)
+        with self._lock:
+            if generation != self.generation(db_id):
+                # A write into this database landed while the query was in flight.
+                return
+            self._entries[k] = (db_id, time.monotonic(), list(results))
+            self._entries.move_to_end(k)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear_db(self, db_id: str):
+        with self._lock:
+            self._generations[db_id] = self._generations.get(db_id, 0) + 1
+            for k in [k for k, entry in self._entries.items() if entry[0] == db_id]:
+                del self._entries[k]
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+
+QUERY_CACHE = QueryCache(QUERY_CACHE_TTL, QUERY_CACHE_SIZE)
+
 # Notion API helpers
 def notion_post(path: str, payload: dict) -> dict:
     url = f"{NOTION_API}{path}"
-    return http_request_with_retries("post", url, HEADERS, json_payload=payload)
+    res = http_request_with_retries("post", url, json_payload=payload)
+    parent_db = payload.get("parent", {}).get("database_id")
+    if parent_db:
+        QUERY_CACHE.clear_db(parent_db)
+    return res
 
 def notion_patch(path: str, payload: dict) -> dict:
     url = f"{NOTION_API}{path}"
-    return http_request_with_retries("patch", url, HEADERS, json_payload=payload)
+    res = http_request_with_retries("patch", url, json_payload=payload)
+    # A patched page may no longer match cached filters; we don't know its database here.
+    QUERY_CACHE.clear()
+    return res
 
 def notion_get(path: str, params: Optional[dict]=None) -> dict:
     url = f"{NOTION_API}{path}"
-    return http_request_with_retries("get", url, HEADERS, params=params)
+    return http_request_with_retries("get", url, params=params)
 
 # Utilities for Notion property formatting
+# Empty/default shapes are shared module constants rather than rebuilt per row.
+# Payloads are only ever serialised, never mutated, so sharing them is safe.
+_EMPTY_PROP: dict = {}
+_EMPTY_TITLE = {"title": []}
+_EMPTY_RICH_TEXT = {"rich_text": []}
+_EMPTY_DATE = {"date": None}
+_CHECKBOX_TRUE = {"checkbox": True}
+_CHECKBOX_FALSE = {"checkbox": False}
+_DEFAULT_SELECTS = {name: {"select": {"name": name}} for name in ("Applied", "Medium", "Cold", "Pending")}
+
 def title_prop(text: str) -> dict:
-    return {"title": [{"text": {"content": text}}]}
+    return {"title": [{"text": {"content": text}}]} if text else _EMPTY_TITLE
 
 def rich_text_prop(text: str) -> dict:
-    return {"rich_text": [{"text": {"content": text}}]}
+    return {"rich_text": [{"text": {"content": text}}]} if text else _EMPTY_RICH_TEXT
 
 def select_prop(name: str) -> dict:
-    return {"select": {"name": name}}
+    return _DEFAULT_SELECTS.get(name) or {"select": {"name": name}}
 
 def date_prop(iso: Optional[str]) -> dict:
     if iso:
         return {"date": {"start": iso}}
-    return {"date": None}
+    return _EMPTY_DATE
 
 def url_prop(url: Optional[str]) -> dict:
-    return {"url": url} if url else {}
+    return {"url": url} if url else _EMPTY_PROP
 
 def checkbox_prop(value: bool) -> dict:
-    return {"checkbox": bool(value)}
+    return _CHECKBOX_TRUE if value else _CHECKBOX_FALSE
 
 def relation_prop(page_id: Optional[str]) -> dict:
     if page_id:
         return {"relation": [{"id": page_id}]}
-    return {}
+    return _EMPTY_PROP
 
 # ---------------- Core operations ----------------
-def create_job_application(company: str, role: str, jd_summary: str = "", jd_link: str = "", location: str = "", salary_range: str = "", priority: str = "Medium") -> dict:
-    logging.info(f"Creating job application: {company} — {role}")
-    now_iso = datetime.now(timezone.utc).isoformat()
+# build_*_payload functions only shape the request body; the matching create/add
+# functions below send it. Bulk callers (prefill) build payloads up front.
+def build_application_payload(company: str, role: str, jd_summary: str = "", jd_link: str = "", location: str = "", salary_range: str = "", priority: str = "Medium", date_applied: Optional[str] = None) -> dict:
     properties = {
         "Company": title_prop(company),
         "Role": rich_text_prop(role),
-        "Date Applied": date_prop(now_iso),
+        "Date Applied": date_prop(date_applied or datetime.now(timezone.utc).isoformat()),
         "Status": select_prop("Applied"),
         "JD Summary": rich_text_prop(jd_summary),
         "JD Link": url_prop(jd_link),
@@ -139,25 +329,21 @@ def create_job_application(company: str, role: str, jd_summary: str = "", jd_lin
         "Salary Range": rich_text_prop(salary_range),
         "Priority": select_prop(priority)
     }
-    payload = {"parent": {"database_id": DB_JOB_APPS}, "properties": properties}
-    return notion_post("/pages", payload)
+    return {"parent": {"database_id": DB_JOB_APPS}, "properties": properties}
 
-def add_network_contact(name: str, company: str = "", role: str = "", linkedin: str = "", email: str = "", status: str = "Cold") -> dict:
-    logging.info(f"Adding network contact: {name} @ {company}")
+def build_network_payload(name: str, company: str = "", role: str = "", linkedin: str = "", email: str = "", status: str = "Cold") -> dict:
     properties = {
         "Name": title_prop(name),
         "Company": rich_text_prop(company),
         "Role": rich_text_prop(role),
         "LinkedIn": url_prop(linkedin),
-        "Email": {"email": email} if email else {},
+        "Email": {"email": email} if email else _EMPTY_PROP,
         "Status": select_prop(status),
         "Last Contacted": date_prop(None)
     }
-    payload = {"parent": {"database_id": DB_NETWORKING}, "properties": properties}
-    return notion_post("/pages", payload)
+    return {"parent": {"database_id": DB_NETWORKING}, "properties": properties}
 
-def add_interview(application_page_id: str, stage: str, interviewer: str = "", date_iso: Optional[str] = None, notes: str = "", outcome: str = "Pending") -> dict:
-    logging.info(f"Adding interview record for application {application_page_id} stage {stage}")
+def build_interview_payload(application_page_id: str, stage: str, interviewer: str = "", date_iso: Optional[str] = None, notes: str = "", outcome: str = "Pending") -> dict:
     props = {
         "Application": relation_prop(application_page_id),
         "Stage": select_prop(stage),
@@ -166,23 +352,44 @@ def add_interview(application_page_id: str, stage: str, interviewer: str = "", d
         "Notes": rich_text_prop(notes),
         "Outcome": select_prop(outcome)
     }
-    payload = {"parent": {"database_id": DB_INTERVIEWS}, "properties": props}
-    return notion_post("/pages", payload)
+    return {"parent": {"database_id": DB_INTERVIEWS}, "properties": props}
 
-def add_followup(task: str, related_application_page_id: Optional[str] = None, due_date_iso: Optional[str] = None, completed: bool = False, notes: str = "") -> dict:
-    logging.info(f"Creating follow-up task: {task}")
+def build_followup_payload(task: str, related_application_page_id: Optional[str] = None, due_date_iso: Optional[str] = None, completed: bool = False, notes: str = "") -> dict:
     props = {
         "Task": title_prop(task),
-        "Related Application": relation_prop(related_application_page_id) if related_application_page_id else {},
-        "Due Date": date_prop(due_date_iso) if due_date_iso else {},
+        "Related Application": relation_prop(related_application_page_id),
+        "Due Date": date_prop(due_date_iso) if due_date_iso else _EMPTY_PROP,
         "Completed": checkbox_prop(completed),
         "Notes": rich_text_prop(notes)
     }
-    payload = {"parent": {"database_id": DB_FOLLOWUPS}, "properties": props}
+    return {"parent": {"database_id": DB_FOLLOWUPS}, "properties": props}
+
+def create_job_application(company: str, role: str, jd_summary: str = "", jd_link: str = "", location: str = "", salary_range: str = "", priority: str = "Medium") -> dict:
+    logging.info("Creating job application: %s — %s", company, role)
+    payload = build_application_payload(company, role, jd_summary, jd_link, location, salary_range, priority)
+    return notion_post("/pages", payload)
+
+def add_network_contact(name: str, company: str = "", role: str = "", linkedin: str = "", email: str = "", status: str = "Cold") -> dict:
+    logging.info("Adding network contact: %s @ %s", name, company)
+    payload = build_network_payload(name, company, role, linkedin, email, status)
+    return notion_post("/pages", payload)
+
+def add_interview(application_page_id: str, stage: str, interviewer: str = "", date_iso: Optional[str] = None, notes: str = "", outcome: str = "Pending") -> dict:
+    logging.info("Adding interview record for application %s stage %s", application_page_id, stage)
+    payload = build_interview_payload(application_page_id, stage, interviewer, date_iso, notes, outcome)
+    return notion_post("/pages", payload)
+
+def add_followup(task: str, related_application_page_id: Optional[str] = None, due_date_iso: Optional[str] = None, completed: bool = False, notes: str = "") -> dict:
+    logging.info("Creating follow-up task: %s", task)
+    payload = build_followup_payload(task, related_application_page_id, due_date_iso, completed, notes)
     return notion_post("/pages", payload)
 
 # Simple search helper: query database by property (e.g. Company and Role)
 def query_database_by_name(db_id: str, property_name: str, value: str) -> List[dict]:
+    cached = QUERY_CACHE.get(db_id, property_name, value)
+    if cached is not None:
+        return cached
+    generation = QUERY_CACHE.generation(db_id)
     # Basic filter for 'title' or 'rich_text' depending on property type.
     # Notion's filter JSON is a bit verbose; we'll try common cases.
     payload = {
@@ -193,59 +400,93 @@ def query_database_by_name(db_id: str, property_name: str, value: str) -> List[d
         "page_size": 50
     }
     res = notion_post(f"/databases/{db_id}/query", payload)
-    return res.get("results", [])
+    results = res.get("results", [])
+    QUERY_CACHE.set(db_id, property_name, value, results, generation)
+    return results
 
 # Prefill CSV utilities
+def _build_followup_from_csv(completed: str = "False", **kwargs) -> dict:
+    return build_followup_payload(completed=completed.lower() == "true", **kwargs)
+
+# db_type -> (payload builder, ((CSV column, builder kwarg, default if column missing), ...))
+CSV_SPECS = {
+    "applications": (build_application_payload, (
+        ("Company", "company", ""),
+        ("Role", "role", ""),
+        ("JD Summary", "jd_summary", ""),
+        ("JD Link", "jd_link", ""),
+        ("Location", "location", ""),
+        ("Salary Range", "salary_range", ""),
+        ("Priority", "priority", "Medium"),
+    )),
+    "networking": (build_network_payload, (
+        ("Name", "name", ""),
+        ("Company", "company", ""),
+        ("Role", "role", ""),
+        ("LinkedIn", "linkedin", ""),
+        ("Email", "email", ""),
+        ("Status", "status", "Cold"),
+    )),
+    "interviews": (build_interview_payload, (
+        ("Application", "application_page_id", ""),
+        ("Stage", "stage", ""),
+        ("Interviewer", "interviewer", ""),
+        ("Date", "date_iso", ""),
+        ("Notes", "notes", ""),
+        ("Outcome", "outcome", "Pending"),
+    )),
+    "followups": (_build_followup_from_csv, (
+        ("Task", "task", ""),
+        ("Related Application", "related_application_page_id", ""),
+        ("Due Date", "due_date_iso", ""),
+        ("Completed", "completed", "False"),
+        ("Notes", "notes", ""),
+    )),
+}
+CSV_DB_TYPES = tuple(CSV_SPECS)
+
+def _csv_row_extractor(header: List[str], columns: tuple):
+    """Resolve column positions once; the returned function maps a csv.reader row to builder kwargs."""
+    positions = {name: i for i, name in enumerate(header)}
+    plan = [(positions.get(col), kwarg, default) for col, kwarg, default in columns]
+
+    def extract(row: List[str]) -> dict:
+        n = len(row)
+        return {kwarg: row[i] if i is not None and i < n else default for i, kwarg, default in plan}
+
+    return extract
+
 def prefill_from_csv(csv_path: str, db_type: str = "applications"):
-    p = Path(csv_path)
-    if not p.exists():
-        logging.error(f"CSV not found: {csv_path}")
+    if db_type not in CSV_DB_TYPES:
+        logging.error("Unknown CSV type: %s", db_type)
+        return
+    now_iso = datetime.now(timezone.utc).isoformat()
+    build, columns = CSV_SPECS[db_type]
+    if db_type == "applications":
+        build = partial(build, date_applied=now_iso)
+    try:
+        f = open(csv_path, newline='', encoding='utf-8')
+    except FileNotFoundError:
+        logging.error("CSV not found: %s", csv_path)
         return
-    with p.open(newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        count = 0
-        for row in reader:
+    with f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            logging.info("CSV is empty: %s", csv_path)
+            return
+        extract = _csv_row_extractor(header, columns)
+        payloads = [build(**extract(row)) for row in reader if row]
+    count = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {pool.submit(notion_post, "/pages", payload): payload for payload in payloads}
+        for fut in as_completed(futures):
             try:
-                if db_type == "applications":
-                    create_job_application(
-                        company=row.get("Company",""),
-                        role=row.get("Role",""),
-                        jd_summary=row.get("JD Summary",""),
-                        jd_link=row.get("JD Link",""),
-                        location=row.get("Location",""),
-                        salary_range=row.get("Salary Range",""),
-                        priority=row.get("Priority","Medium")
-                    )
-                elif db_type == "networking":
-                    add_network_contact(
-                        name=row.get("Name",""),
-                        company=row.get("Company",""),
-                        role=row.get("Role",""),
-                        linkedin=row.get("LinkedIn",""),
-                        email=row.get("Email",""),
-                        status=row.get("Status","Cold")
-                    )
-                elif db_type == "interviews":
-                    add_interview(
-                        application_page_id=row.get("Application",""),
-                        stage=row.get("Stage",""),
-                        interviewer=row.get("Interviewer",""),
-                        date_iso=row.get("Date",""),
-                        notes=row.get("Notes",""),
-                        outcome=row.get("Outcome","Pending")
-                    )
-                elif db_type == "followups":
-                    add_followup(
-                        task=row.get("Task",""),
-                        related_application_page_id=row.get("Related Application",""),
-                        due_date_iso=row.get("Due Date",""),
-                        completed=row.get("Completed","False").lower() == "true",
-                        notes=row.get("Notes","")
-                    )
+                fut.result()
                 count += 1
             except Exception as e:
-                logging.exception(f"Failed to insert row: {row} - {e}")
-        logging.info(f"Prefilled {count} rows into {db_type}")
+                logging.exception("Failed to insert row: %s - %s", futures[fut]["properties"], e)
+    logging.info("Prefilled %s rows into %s", count, db_type)
 
 # ---------------- Thread-based sync ----------------
 # project_threads.json format:
@@ -254,86 +495,120 @@ def prefill_from_csv(csv_path: str, db_type: str = "applications"):
 # ]
 
 def load_project_threads(path: str = "project_threads.json") -> List[Dict[str, Any]]:
-    p = Path(path)
-    if not p.exists():
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json_loads(f.read())
+    except FileNotFoundError:
         logging.info("No project_threads.json found; returning empty list.")
         return []
-    with p.open("r", encoding="utf-8") as f:
-        data = json.load(f)
     return data
 
 def write_project_threads(data: List[Dict[str, Any]], path: str = "project_threads.json"):
-    p = Path(path)
-    with p.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Write to a sibling temp file and swap it in, so a crash mid-write never
+    # leaves a truncated project_threads.json behind.
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json_dumps_pretty(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _do_create_app(cmd: dict) -> dict:
+    return create_job_application(
+        company=cmd.get("company",""),
+        role=cmd.get("role",""),
+        jd_summary=cmd.get("jd_summary",""),
+        jd_link=cmd.get("jd_link",""),
+        location=cmd.get("location",""),
+        salary_range=cmd.get("salary_range",""),
+        priority=cmd.get("priority","Medium")
+    )
+
+def _do_add_followup(cmd: dict) -> dict:
+    return add_followup(
+        task=cmd.get("task","Follow up"),
+        related_application_page_id=cmd.get("related_application_page_id"),
+        due_date_iso=cmd.get("due_date"),
+        completed=False,
+        notes=cmd.get("notes","")
+    )
+
+def _do_add_network(cmd: dict) -> dict:
+    return add_network_contact(
+        name=cmd.get("name",""),
+        company=cmd.get("company",""),
+        role=cmd.get("role",""),
+        linkedin=cmd.get("linkedin",""),
+        email=cmd.get("email",""),
+        status=cmd.get("status","Cold")
+    )
+
+# Thread command "action" -> handler taking the parsed command dict
+ACTIONS = {
+    "create_application": _do_create_app,
+    "add_followup": _do_add_followup,
+    "add_network_contact": _do_add_network,
+}
 
 def process_thread_command(cmd: dict):
     action = cmd.get("action")
-    if action == "create_application":
-        return create_job_application(
-            company=cmd.get("company",""),
-            role=cmd.get("role",""),
-            jd_summary=cmd.get("jd_summary",""),
-            jd_link=cmd.get("jd_link",""),
-            location=cmd.get("location",""),
-            salary_range=cmd.get("salary_range",""),
-            priority=cmd.get("priority","Medium")
-        )
-    elif action == "add_followup":
-        return add_followup(
-            task=cmd.get("task","Follow up"),
-            related_application_page_id=cmd.get("related_application_page_id"),
-            due_date_iso=cmd.get("due_date"),
-            completed=False,
-            notes=cmd.get("notes","")
-        )
-    elif action == "add_network_contact":
-        return add_network_contact(
-            name=cmd.get("name",""),
-            company=cmd.get("company",""),
-            role=cmd.get("role",""),
-            linkedin=cmd.get("linkedin",""),
-            email=cmd.get("email",""),
-            status=cmd.get("status","Cold")
-        )
-    else:
-        raise ValueError(f"Unknown action: {action}")
+    try:
+        handler = ACTIONS[action]
+    except KeyError:
+        raise ValueError(f"Unknown action: {action}") from None
+    return handler(cmd)
 
 def run_sync(project_threads_path: str = "project_threads.json"):
     threads = load_project_threads(project_threads_path)
     if not threads:
         logging.info("No threads to sync.")
         return
-    now = datetime.now(timezone.utc)
-    two_hours = timedelta(hours=2)
+    # Threads must be untouched for 2+ hours; compare epoch seconds against a single cutoff.
+    cutoff_ts = (datetime.now(timezone.utc) - timedelta(hours=2)).timestamp()
     any_synced = False
+    eligible = []
     for t in threads:
+        # Most threads are already synced; skip them before any timestamp parsing.
+        if t.get("synced"):
+            continue
         try:
-            last_updated = datetime.fromisoformat(t["last_updated"].replace("Z", "+00:00"))
+            last_updated_ts = datetime.fromisoformat(t["last_updated"].replace("Z", "+00:00")).timestamp()
         except Exception as e:
-            logging.warning(f"Invalid last_updated for thread {t.get('thread_id')}: {e}")
+            logging.warning("Invalid last_updated for thread %s: %s", t.get("thread_id"), e)
             continue
-        synced = t.get("synced", False)
-        if not synced and (now - last_updated) >= two_hours:
-            logging.info(f"Thread {t['thread_id']} eligible for sync (last updated {t['last_updated']}).")
+        if last_updated_ts <= cutoff_ts:
+            logging.info("Thread %s eligible for sync (last updated %s).", t["thread_id"], t["last_updated"])
             content = t.get("content", "")
             try:
-                cmd = json.loads(content) if isinstance(content, str) and content.strip() else {}
+                cmd = json_loads(content) if isinstance(content, str) and content.strip() else {}
             except Exception as e:
-                logging.exception(f"Failed to parse content JSON for thread {t['thread_id']}: {e}")
+                logging.exception("Failed to parse content JSON for thread %s: %s", t["thread_id"], e)
                 continue
-            try:
-                if cmd:
-                    process_thread_command(cmd)
+            if cmd:
+                eligible.append((t, cmd))
+            else:
+                logging.info("No valid command found in thread %s; skipping.", t["thread_id"])
+    if eligible:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = {pool.submit(process_thread_command, cmd): t for t, cmd in eligible}
+            for fut in as_completed(futures):
+                t = futures[fut]
+                try:
+                    fut.result()
                     t["synced"] = True
                     any_synced = True
-                else:
-                    logging.info(f"No valid command found in thread {t['thread_id']}; skipping.")
-            except Exception as e:
-                logging.exception(f"Failed to process thread {t['thread_id']}: {e}")
+                except Exception as e:
+                    logging.exception("Failed to process thread %s: %s", t["thread_id"], e)
     if any_synced:
-        write_project_threads(threads)
-        logging.info("Sync completed and project_threads.json updated.")
+        write_project_threads(threads, project_threads_path)
+        logging.info("Sync completed and %s updated.", project_threads_path)
     else:
         logging.info("No threads were synced at this time.")
 
@@ -362,7 +637,7 @@ def build_cli():
 
     p_prefill = sub.add_parser("prefill_csv", help="Prefill from CSV")
     p_prefill.add_argument("--csv", required=True)
-    p_prefill.add_argument("--type", choices=["applications","networking","interviews","followups"], default="applications")
+    p_prefill.add_argument("--type", choices=list(CSV_DB_TYPES), default="applications")
 
     p_sync = sub.add_parser("run_sync", help="Run thread-based sync")
     p_sync.add_argument("--threads", default="project_threads.json")